@@ -11,100 +11,278 @@ Extracts structured data from resumes:
 - References
 """
 
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
 import fitz  # PyMuPDF
-import docx
 import re
-import pytesseract
+from PIL import Image
+
+try:
+    # In-process Tesseract API: no subprocess spawn per page
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+log = logging.getLogger(__name__)
+
+_pytess = None
+
+
+def _pytesseract():
+    """
+    Import and configure pytesseract on first OCR use, so DOCX-only and
+    text-PDF workloads never pay for it. The tesseract binary is found
+    via the TESSERACT_CMD env var or PATH instead of a hard-coded path.
+    """
+    global _pytess
+    if _pytess is None:
+        import pytesseract
+        cmd = os.environ.get('TESSERACT_CMD') or shutil.which('tesseract')
+        if cmd:
+            pytesseract.pytesseract.tesseract_cmd = cmd
+        _pytess = pytesseract
+    return _pytess
+
+
+# Pre-compiled patterns (compiling once at import avoids re-parsing /
+# cache lookups on every call)
+_EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+')
+_PHONE_RE = re.compile(r'\+?\d[\d -]{8,}\d', re.ASCII)
+_EDU_RE = re.compile(
+    r'^.*(?:Bachelor|Master|PhD|B\.Sc|M\.Sc|B\.Tech|M\.Tech).*?,.*$',
+    re.IGNORECASE | re.MULTILINE)
+_HEADER_RE = re.compile(r'^[A-Za-z ]+:$')  # e.g. "Experience:"
+
+# Common Tesseract misreads seen in scanned resumes (mostly section headers)
+OCR_CORRECTIONS = {
+    'Expenence': 'Experience',
+    'Educat1on': 'Education',
+    'Pr0jects': 'Projects',
+    'Certif1cations': 'Certifications',
+    'Sk1lls': 'Skills',
+}
+
+# One alternation applies every correction in a single pass; the lookup
+# dict resolves each match to its replacement
+_OCR_LOOKUP = {k.lower(): v for k, v in OCR_CORRECTIONS.items()}
+_OCR_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(k) for k in OCR_CORRECTIONS) + r')\b',
+    re.IGNORECASE)
+
+
+def _ocr_correct(match):
+    return _OCR_LOOKUP[match.group(0).lower()]
+
+
+def clean_ocr_text(text):
+    """
+    Normalize OCR output: fix common misreads and collapse stray
+    whitespace within each line (newlines are kept for sectioning).
+    """
+    text = _OCR_RE.sub(_ocr_correct, text)
+    # str.split/join normalizes whitespace in one C-level pass, faster
+    # than running the regex engine over every character
+    lines = [' '.join(line.split()) for line in text.split('\n')]
+    return '\n'.join(lines)
+
+
+_tess_local = threading.local()
+
+
+def _tesserocr_api():
+    """
+    One PyTessBaseAPI per thread, created on first use: the language
+    model loads once and is reused across that thread's pages
+    (tesserocr.image_to_text would reload it per call, and a single
+    shared API instance is not thread-safe).
+    """
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        api = _tess_local.api = tesserocr.PyTessBaseAPI()
+    return api
+
+
+def _ocr_page(png_bytes):
+    image = Image.open(io.BytesIO(png_bytes))
+    if tesserocr is not None:
+        api = _tesserocr_api()
+        api.SetImage(image)
+        text = api.GetUTF8Text()
+    else:
+        text = _pytesseract().image_to_string(image)
+    return clean_ocr_text(text) + '\n'
+
+
+# If a document already has this much embedded text, it is not a scan
+# and OCR is skipped entirely
+_MIN_DOC_TEXT = 500
+
+# Minimal extraction flags: keep ligatures/whitespace as stored and skip
+# mediabox clipping; "text" mode never extracts images
+_TEXT_FLAGS = fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE
 
-# Set the path to the tesseract.exe inside your repo folder
-pytesseract.pytesseract.tesseract_cmd = r'E:\AI&DS\SmartJobMatchAI\smart-job-match-ai-main\tesseract\tesseract.exe'
 
 def extract_text_from_pdf(file_path):
-    text = ""
+    # Collect page texts and join once (repeated += copies the whole
+    # buffer on every page)
+    parts = []
+    ocr_jobs = []  # (page number, rendered page) for scanned pages
     with fitz.open(file_path) as pdf:
+        embedded_chars = 0
+        candidates = []  # pages with no text but embedded raster images
         for page in pdf:
-            text += page.get_text()
-    return text
+            page_text = page.get_text("text", flags=_TEXT_FLAGS)
+            embedded_chars += len(page_text.strip())
+            if not page_text.strip() and page.get_images(full=False):
+                candidates.append(page.number)
+            parts.append(page_text)
+        # Rasterize only when the document as a whole looks scanned;
+        # hybrid PDFs with enough embedded text skip OCR completely
+        if candidates and embedded_chars < _MIN_DOC_TEXT:
+            ocr_jobs = [(n, pdf[n].get_pixmap(dpi=200).tobytes("png"))
+                        for n in candidates]
+    if ocr_jobs:
+        # Threads OCR pages concurrently: pytesseract shells out to a
+        # subprocess and tesserocr releases the GIL during recognition
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            results = ex.map(_ocr_page, [png for _, png in ocr_jobs])
+            for (idx, _), ocr_text in zip(ocr_jobs, results):
+                parts[idx] = ocr_text
+    return "".join(parts)
+
+
+# WordprocessingML namespace inside word/document.xml
+_DOCX_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
 
 
 def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    text = ""
-    for para in doc.paragraphs:
-        text += para.text + "\n"
-    return text
+    # Read word/document.xml directly: python-docx builds a full
+    # Paragraph/Run object graph just to yield para.text
+    with zipfile.ZipFile(file_path) as z, z.open('word/document.xml') as f:
+        tree = ET.parse(f)
+    parts = []
+    for para in tree.iter('{%s}p' % _DOCX_NS):
+        parts.append(''.join(t.text or ''
+                             for t in para.iter('{%s}t' % _DOCX_NS)))
+    return "\n".join(parts) + "\n"
+
+
+# Contact info is nearly always in the first lines of a resume, so try
+# a bounded prefix before scanning the whole document
+_CONTACT_PREFIX = 2000
+
+
+def _search_contact(pattern, text):
+    match = pattern.search(text, 0, _CONTACT_PREFIX)
+    if len(text) > _CONTACT_PREFIX:
+        if match is None:
+            match = pattern.search(text)
+        else:
+            # A bounded match can be truncated by endpos (the engine may
+            # even backtrack to end before it), so confirm against the
+            # full string; anchoring at the found start keeps it cheap
+            match = pattern.search(text, match.start())
+    return match
 
 
 def extract_email(text):
-    match = re.search(r'[\w\.-]+@[\w\.-]+', text)
+    match = _search_contact(_EMAIL_RE, text)
     return match.group(0) if match else None
 
 
 def extract_phone(text):
-    match = re.search(r'\+?\d[\d -]{8,}\d', text)
+    match = _search_contact(_PHONE_RE, text)
     return match.group(0) if match else None
 
 
-def extract_skills(text, skills_list):
-    return [skill for skill in skills_list if skill.lower() in text.lower()]
+# Default skill vocabulary, hoisted out of parse_resume; the lowercase
+# forms are computed once instead of per call
+SKILLS_LIST = ('Python', 'Java', 'Machine Learning', 'Data Analysis', 'SQL',
+               'Pandas', 'NumPy', 'Scikit-learn', 'Flask')
+_SKILLS_LOWER = tuple(s.lower() for s in SKILLS_LIST)
+
+
+def extract_skills(text, skills_list=SKILLS_LIST):
+    # Lowercase the resume once instead of once per skill
+    low = text.lower()
+    if skills_list is SKILLS_LIST:
+        pairs = zip(SKILLS_LIST, _SKILLS_LOWER)
+    else:
+        pairs = ((s, s.lower()) for s in skills_list)
+    return [skill for skill, skill_low in pairs if skill_low in low]
 
 
 def extract_education(text):
-    lines = text.split('\n')
-    education = []
-    for line in lines:
-        if re.search(r'(Bachelor|Master|PhD|B\.Sc|M\.Sc|B\.Tech|M\.Tech).*?,', line, re.IGNORECASE):
-            education.append(line.strip())
-    return education
+    # Line-anchored multiline pattern scans the raw text in one pass,
+    # avoiding the split into lines and a regex call per line
+    return [m.group(0).strip() for m in _EDU_RE.finditer(text)]
 
 
-def extract_section_block(text, section_title):
+# Known section headers, lowercased without the trailing colon
+_SECTION_NAMES = ('certifications', 'experience', 'projects',
+                  'publications', 'references')
+
+# One alternation regex identifies the matching section via named groups
+# in a single C-level scan, instead of a Python-level loop over the names
+_SECTION_ALT_RE = re.compile(
+    r'^(?:' + '|'.join('(?P<%s>%s)' % (name, name) for name in _SECTION_NAMES)
+    + r'):?$',
+    re.IGNORECASE)
+
+
+def segment_sections(text):
     """
-    Extract lines under a specific section until the next section or empty line.
+    Split the resume into named sections in a single pass over the lines.
+
+    Returns a dict mapping section name (lowercase) to the list of
+    stripped lines under that header. Unknown headers and blank lines
+    close the current section.
     """
-    lines = text.split('\n')
-    block = []
-    capture = False
-    for line in lines:
-        if section_title.lower() in line.lower():
-            capture = True
+    sections = {}
+    current = None
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped == '':
+            current = None
+            continue
+        m = _SECTION_ALT_RE.match(stripped)
+        if m:
+            current = sections.setdefault(m.lastgroup, [])
+            continue
+        # Cheap endswith check filters out body lines before the regex
+        # engine is consulted at all
+        if stripped.endswith(':') and _HEADER_RE.match(stripped):
+            current = None  # some other section header
             continue
-        if capture:
-            if line.strip() == '' or re.match(r'^[A-Za-z ]+:$', line.strip()):  # Next section header
-                break
-            block.append(line.strip())
-    return block
+        if current is not None:
+            current.append(stripped)
+    return sections
 
 
 def extract_certifications(text):
-    return extract_section_block(text, 'Certifications')
+    return segment_sections(text).get('certifications', [])
 
 
 def extract_experience(text):
-    lines = text.split('\n')
-    experience = []
-    capture = False
-    for line in lines:
-        # Only start capturing when hitting exact section header 'Experience:'
-        if line.strip().lower() == 'experience:':
-            capture = True
-            continue
-        if capture:
-            # Stop at next section header (line ending with ':') or blank line
-            if line.strip() == '' or re.match(r'^[A-Za-z ]+:$', line.strip()):
-                break
-            # Capture non-empty lines
-            if line.strip():
-                experience.append(line.strip())
-    return experience
+    return segment_sections(text).get('experience', [])
 
 
 def extract_projects(text):
-    return extract_section_block(text, 'Projects')
+    return segment_sections(text).get('projects', [])
 
 
 def extract_publications(text):
-    return extract_section_block(text, 'Publications')
+    return segment_sections(text).get('publications', [])
 
 
 def extract_references(text):
@@ -113,28 +291,48 @@ def extract_references(text):
     return []
 
 
-def parse_resume(file_path):
-    skills_list = ['Python', 'Java', 'Machine Learning', 'Data Analysis', 'SQL',
-                   'Pandas', 'NumPy', 'Scikit-learn', 'Flask']
+# Parsed resumes are cached on disk keyed by file content hash
+_CACHE_DIR = Path.home() / '.cache' / 'smart-job-match' / 'resumes'
+
+
+def _write_cache_file(path, data):
+    # Write-then-rename so a concurrent reader never sees a partial file
+    # (the cache may be shared across parse_resumes workers or CI jobs)
+    tmp = path.with_name('%s.%d.tmp' % (path.name, os.getpid()))
+    tmp.write_text(data, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def parse_resume(file_path, use_cache=True):
+    if not file_path.endswith(('.pdf', '.docx')):
+        raise ValueError("Unsupported file type")
+
+    # Same bytes -> same result: serve repeat parses from the cache
+    if use_cache:
+        key = hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+        cache_file = _CACHE_DIR / (key + '.json')
+        try:
+            return json.loads(cache_file.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            pass  # missing or unreadable entry: fall through and re-parse
 
     # Extract raw text
     if file_path.endswith('.pdf'):
         text = extract_text_from_pdf(file_path)
-    elif file_path.endswith('.docx'):
-        text = extract_text_from_docx(file_path)
     else:
-        raise ValueError("Unsupported file type")
+        text = extract_text_from_docx(file_path)
 
-    print("Extracted Text:", text)  # Debugging line to check extracted text
-    # Extract fields
+    log.debug("Extracted text (%d chars) from %s", len(text), file_path)
+    # Extract fields (sections are segmented in a single pass over the text)
+    secs = segment_sections(text)
     email = extract_email(text)
     phone = extract_phone(text)
-    skills = extract_skills(text, skills_list)
+    skills = extract_skills(text)
     education = extract_education(text)
-    certifications = extract_certifications(text)
-    experience = extract_experience(text)
-    projects = extract_projects(text)
-    publications = extract_publications(text)
+    certifications = secs.get('certifications', [])
+    experience = secs.get('experience', [])
+    projects = secs.get('projects', [])
+    publications = secs.get('publications', [])
     references = extract_references(text)
 
     result = {
@@ -149,9 +347,30 @@ def parse_resume(file_path):
         "references": references
     }
 
+    if use_cache:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Keep the extracted text too, so it can be re-mined without
+        # paying the PDF/OCR cost again
+        _write_cache_file(_CACHE_DIR / (key + '.txt'), text)
+        _write_cache_file(cache_file, json.dumps(result))
+
     return result
 
 
+def parse_resumes(paths, workers=None):
+    """
+    Parse many resumes in parallel, one process per core by default.
+
+    parse_resume is CPU-bound (PDF decode + OCR + regex) and independent
+    per file, so a process pool scales with core count; chunksize
+    amortizes the pickling cost per task. Results come back in input
+    order, and repeat files still hit the disk cache inside the workers.
+    """
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(parse_resume, paths, chunksize=8))
+
+
 if __name__ == "__main__":
     test_file = "sample_resume.pdf"  # Replace with your test file path
     parsed_data = parse_resume(test_file)